@@ -3,13 +3,45 @@ Core ML Functions with Explainability
 All functions return predictions with confidence scores and explanations
 """
 
+import time
+from functools import wraps
+
 import numpy as np
 from datetime import datetime, timedelta, timezone
 from typing import Dict, List, Any
 from scipy import stats
 from sklearn.linear_model import LinearRegression
 
+# In-process cache for the read-only prediction functions. Predictions are
+# deterministic over recent DB data, so overlapping endpoint calls and
+# repeated requests within a short window can share one computation.
+_PREDICTION_CACHE_TTL = 300  # seconds
+_PREDICTION_CACHE_MAX = 128
+_prediction_cache: Dict[tuple, tuple] = {}
+
+
+def cached_prediction(func):
+    """Memoize an async prediction function keyed on its arguments with a TTL"""
+    @wraps(func)
+    async def wrapper(*args, **kwargs):
+        key = (func.__name__, args, tuple(sorted(kwargs.items())))
+        now = time.time()
+        hit = _prediction_cache.get(key)
+        if hit and now - hit[0] < _PREDICTION_CACHE_TTL:
+            return hit[1]
+
+        result = await func(*args, **kwargs)
+
+        if len(_prediction_cache) >= _PREDICTION_CACHE_MAX:
+            # Drop the oldest entry to bound memory
+            oldest = min(_prediction_cache, key=lambda k: _prediction_cache[k][0])
+            del _prediction_cache[oldest]
+        _prediction_cache[key] = (now, result)
+        return result
+    return wrapper
+
 
+@cached_prediction
 async def forecast_metrics(city: str, days: int = 7) -> Dict[str, Any]:
     """
     Forecast environmental and traffic metrics using moving average + linear regression
@@ -152,6 +184,7 @@ async def forecast_metrics(city: str, days: int = 7) -> Dict[str, Any]:
     }
 
 
+@cached_prediction
 async def calculate_risk_score(city: str) -> Dict[str, Any]:
     """
     Calculate comprehensive risk score (0-1) based on current conditions
@@ -303,6 +336,7 @@ async def calculate_risk_score(city: str) -> Dict[str, Any]:
     }
 
 
+@cached_prediction
 async def detect_anomalies(city: str, hours: int = 24) -> Dict[str, Any]:
     """
     Detect anomalies using z-score and IQR methods
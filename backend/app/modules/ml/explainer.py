@@ -4,6 +4,7 @@ Provides human-readable explanations for all ML predictions
 NO BLACK-BOX AI - Every prediction must be explained
 """
 
+import asyncio
 from typing import Dict, Any, List
 from datetime import datetime, timedelta, timezone
 import numpy as np
@@ -316,23 +317,24 @@ async def generate_city_summary(city: str) -> Dict[str, Any]:
             'explanation': f'City {city} not found in database'
         }
     
-    # Fetch recent data (last 24 hours)
+    # Fetch recent data (last 24 hours) - the three queries are independent,
+    # so run them concurrently instead of stacking their round-trips
     cutoff = datetime.now(timezone.utc) - timedelta(hours=24)
-    
-    env_data = await EnvironmentData.filter(
-        city=city_obj,
-        timestamp__gte=cutoff
-    ).order_by('-timestamp')
-    
-    traffic_data = await TrafficData.filter(
-        city=city_obj,
-        timestamp__gte=cutoff
-    ).order_by('-timestamp')
-    
-    alerts = await Alert.filter(
-        city=city_obj,
-        created_at__gte=cutoff
-    ).order_by('-severity')
+
+    env_data, traffic_data, alerts = await asyncio.gather(
+        EnvironmentData.filter(
+            city=city_obj,
+            timestamp__gte=cutoff
+        ).order_by('-timestamp'),
+        TrafficData.filter(
+            city=city_obj,
+            timestamp__gte=cutoff
+        ).order_by('-timestamp'),
+        Alert.filter(
+            city=city_obj,
+            created_at__gte=cutoff
+        ).order_by('-severity'),
+    )
     
     key_insights = []
     trends = {}
@@ -4,7 +4,7 @@ Ingestion API schemas
 
 from pydantic import BaseModel, Field
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 from .common import DataIngestionBase
 
 
@@ -32,3 +32,15 @@ class IngestionResponse(BaseModel):
     success: bool
     recordId: str
     message: str
+
+
+class BatchIngestInput(BaseModel):
+    environment: List[EnvironmentDataInput] = Field(default_factory=list)
+    traffic: List[TrafficDataInput] = Field(default_factory=list)
+    services: List[ServiceDataInput] = Field(default_factory=list)
+
+
+class BatchIngestionResponse(BaseModel):
+    success: bool
+    recordsIngested: int
+    message: str
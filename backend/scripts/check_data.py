@@ -4,20 +4,12 @@ import sys
 import os
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from tortoise import Tortoise
-from dotenv import load_dotenv
 from app.models import EnvironmentData, TrafficData, Alert, ServiceData
+from scripts._common import init_db_for_script, close_db_for_script
 
 async def main():
-    load_dotenv()
-    
-    db_url = f"postgres://{os.getenv('DB_USER')}:{os.getenv('DB_PASSWORD')}@{os.getenv('DB_HOST')}:{os.getenv('DB_PORT')}/{os.getenv('DB_NAME')}"
-    
-    await Tortoise.init(
-        db_url=db_url,
-        modules={'models': ['app.models']}
-    )
-    
+    await init_db_for_script()
+
     try:
         env_count = await EnvironmentData.all().count()
         traffic_count = await TrafficData.all().count()
@@ -35,7 +27,7 @@ async def main():
             print("   Run data ingestion to populate the database.")
         
     finally:
-        await Tortoise.close_connections()
+        await close_db_for_script()
 
 if __name__ == "__main__":
     asyncio.run(main())
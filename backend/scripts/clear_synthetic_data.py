@@ -18,10 +18,7 @@ load_dotenv(backend_dir / '.env')
 
 from tortoise import Tortoise
 from app.models import EnvironmentData, TrafficData, ServiceData
-from app.config import get_settings
-import ssl
-
-settings = get_settings()
+from scripts._common import init_db_for_script, close_db_for_script
 
 
 async def clear_synthetic_environment_data():
@@ -65,25 +62,8 @@ async def main():
     """Main execution"""
     # Initialize Tortoise ORM
     try:
-        # Build DATABASE_URL from environment variables
-        db_host = os.getenv('DB_HOST', 'localhost')
-        db_port = os.getenv('DB_PORT', '5432')
-        db_user = os.getenv('DB_USER', 'postgres')
-        db_password = os.getenv('DB_PASSWORD', 'postgres')
-        db_name = os.getenv('DB_NAME', 'urban_intelligence')
-        
-        database_url = f"postgres://{db_user}:{db_password}@{db_host}:{db_port}/{db_name}"
-        
-        ssl_context = ssl.create_default_context()
-        ssl_context.check_hostname = False
-        ssl_context.verify_mode = ssl.CERT_NONE
-        
-        await Tortoise.init(
-            db_url=database_url,
-            modules={'models': ['app.models']},
-            _create_db=False
-        )
-        
+        await init_db_for_script()
+
         print("=" * 60)
         print("SYNTHETIC DATA CLEANUP")
         print("=" * 60)
@@ -105,15 +85,20 @@ async def main():
         print("✅ CLEANUP COMPLETE")
         print("=" * 60)
         
-        # Show remaining data
-        env_remaining = await EnvironmentData.all().count()
-        traffic_remaining = await TrafficData.all().count()
-        service_remaining = await ServiceData.all().count()
-        
+        # Show remaining data (single round-trip instead of three counts)
+        conn = Tortoise.get_connection('default')
+        rows = await conn.execute_query_dict(
+            "SELECT "
+            "(SELECT count(*) FROM environment_data) AS env, "
+            "(SELECT count(*) FROM traffic_data) AS traffic, "
+            "(SELECT count(*) FROM service_data) AS service"
+        )
+        remaining = rows[0]
+
         print(f"\n📊 Remaining records:")
-        print(f"   Environment: {env_remaining} (real API data)")
-        print(f"   Traffic: {traffic_remaining}")
-        print(f"   Service: {service_remaining}")
+        print(f"   Environment: {remaining['env']} (real API data)")
+        print(f"   Traffic: {remaining['traffic']}")
+        print(f"   Service: {remaining['service']}")
         
         print("\n💡 TIP: The scheduler will now populate only real API data every 15 minutes")
         
@@ -122,7 +107,7 @@ async def main():
         raise
     
     finally:
-        await Tortoise.close_connections()
+        await close_db_for_script()
 
 
 if __name__ == "__main__":
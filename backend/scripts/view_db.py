@@ -13,6 +13,7 @@ import asyncio
 import sys
 import os
 from dotenv import load_dotenv
+from tortoise import Tortoise
 
 # Load environment variables before importing app modules
 load_dotenv(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '.env'))
@@ -20,7 +21,7 @@ load_dotenv(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file_
 # Add parent directory to path to import app
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from app.database import init_db, close_db
+from scripts._common import init_db_for_script, close_db_for_script
 from app.models import (
     City, EnvironmentData, ServiceData, TrafficData,
     Forecast, Anomaly, RiskScore, Alert, Scenario,
@@ -51,9 +52,16 @@ async def show_table_summary():
     print("DATABASE TABLES SUMMARY")
     print("="*60 + "\n")
     
-    for name, model in MODELS.items():
-        count = await model.all().count()
-        print(f"{name:20} {count:>6} records")
+    # One UNION ALL round-trip instead of 13 separate COUNT statements.
+    # Safe to interpolate: MODELS keys and table names are hard-coded.
+    sql = " UNION ALL ".join(
+        f"SELECT '{name}' AS k, COUNT(*) AS c FROM {model._meta.db_table}"
+        for name, model in MODELS.items()
+    )
+    conn = Tortoise.get_connection("default")
+    rows = await conn.execute_query_dict(sql)
+    for row in rows:
+        print(f"{row['k']:20} {row['c']:>6} records")
     
     print("\n" + "="*60)
     print("Usage: python scripts/view_db.py <table_name> [--limit N]")
@@ -69,38 +77,37 @@ async def show_table_data(table_name: str, limit: int = 20):
         return
     
     model = MODELS[table_name]
-    records = await model.all().limit(limit).order_by("-created_at")
-    
-    if not records:
+    # .values() returns plain dicts - no model instantiation per row
+    rows = await model.all().order_by("-created_at").limit(limit).values()
+
+    if not rows:
         print(f"\n📭 No records found in '{table_name}' table\n")
         return
-    
+
     print(f"\n{'='*80}")
-    print(f"{table_name.upper()} - Showing {len(records)} of {await model.all().count()} records")
+    print(f"{table_name.upper()} - Showing {len(rows)} most recent records")
     print(f"{'='*80}\n")
-    
-    for i, record in enumerate(records, 1):
+
+    for i, record in enumerate(rows, 1):
         print(f"--- Record {i} ---")
-        
-        # Get all fields
-        fields = record._meta.db_fields
-        for field_name in fields:
-            value = getattr(record, field_name, None)
-            
+
+        for field_name, value in record.items():
             # Format value
             if isinstance(value, str) and len(value) > 100:
                 value = value[:100] + "..."
-            
+
             print(f"  {field_name:20} : {value}")
-        
+
         print()
-    
+
     print(f"{'='*80}\n")
 
 
 async def show_users():
     """Special formatter for users table"""
-    users = await User.all().order_by("-created_at")
+    users = await User.all().only(
+        "email", "full_name", "role", "is_active", "last_login", "created_at"
+    ).order_by("-created_at")
     
     if not users:
         print("\n📭 No users registered yet\n")
@@ -122,7 +129,10 @@ async def show_users():
 
 async def show_alerts_summary():
     """Special formatter for alerts table"""
-    alerts = await Alert.all().prefetch_related("city").order_by("-created_at").limit(20)
+    # Only the printed columns (plus city_id for the prefetch join)
+    alerts = await Alert.all().only(
+        "id", "severity", "type", "title", "created_at", "city_id"
+    ).prefetch_related("city").order_by("-created_at").limit(20)
     
     if not alerts:
         print("\n📭 No alerts generated yet\n")
@@ -145,8 +155,8 @@ async def show_alerts_summary():
 
 async def main():
     """Main entry point"""
-    await init_db()
-    
+    await init_db_for_script()
+
     try:
         if len(sys.argv) == 1:
             # No arguments - show summary
@@ -170,7 +180,7 @@ async def main():
                 await show_table_data(table_name, limit)
     
     finally:
-        await close_db()
+        await close_db_for_script()
 
 
 if __name__ == "__main__":
@@ -1,5 +1,8 @@
 """Test GROQ API connection"""
+import json
 import os
+import time
+from pathlib import Path
 from groq import Groq
 from dotenv import load_dotenv
 
@@ -9,38 +12,74 @@ load_dotenv()
 api_key = os.getenv("GROQ_API_KEY")
 print(f"API Key loaded: {api_key[:20]}..." if api_key else "API Key not found!")
 
+# Known-good model cache - skips re-probing every model on warm runs
+CACHE_PATH = Path.home() / ".groq_model_cache.json"
+CACHE_MAX_AGE = 86400 * 7  # re-probe weekly
+
+
+def load_cached_model():
+    """Return the cached working model name, or None if stale/missing"""
+    try:
+        if time.time() - CACHE_PATH.stat().st_mtime < CACHE_MAX_AGE:
+            return json.loads(CACHE_PATH.read_text()).get("model")
+    except (OSError, ValueError):
+        pass
+    return None
+
+
+def save_cached_model(model: str):
+    """Remember the first working model for subsequent runs"""
+    try:
+        CACHE_PATH.write_text(json.dumps({"model": model}))
+    except OSError:
+        pass
+
+
+def probe_model(client: Groq, model: str) -> bool:
+    """Make one round-trip against a model, return True if it works"""
+    try:
+        print(f"Trying model: {model}")
+        response = client.chat.completions.create(
+            model=model,
+            messages=[
+                {"role": "system", "content": "You are a helpful assistant."},
+                {"role": "user", "content": "Say hello"}
+            ],
+            temperature=0.3,
+            max_tokens=50
+        )
+        print(f"✓ Model {model} works!")
+        print(f"Response: {response.choices[0].message.content}")
+        return True
+    except Exception as e:
+        print(f"✗ Model {model} failed: {str(e)[:100]}")
+        return False
+
+
 try:
     client = Groq(api_key=api_key)
     print("Client initialized successfully")
-    
+
     # Try different models - llama-3.1-70b-versatile is decommissioned
     models_to_try = [
         "llama-3.3-70b-versatile",  # Latest Llama 3.3
         "llama-3.1-8b-instant",      # Fallback to 8b
         "mixtral-8x7b-32768"         # Alternative
     ]
-    
+
+    # Short-circuit: probe the cached known-good model first
+    cached = load_cached_model()
+    if cached:
+        print(f"Using cached known-good model: {cached}")
+        models_to_try = [cached] + [m for m in models_to_try if m != cached]
+
     for model in models_to_try:
-        try:
-            print(f"Trying model: {model}")
-            response = client.chat.completions.create(
-                model=model,
-                messages=[
-                    {"role": "system", "content": "You are a helpful assistant."},
-                    {"role": "user", "content": "Say hello"}
-                ],
-                temperature=0.3,
-                max_tokens=50
-            )
-            print(f"✓ Model {model} works!")
-            print(f"Response: {response.choices[0].message.content}")
+        if probe_model(client, model):
+            save_cached_model(model)
             break
-        except Exception as e:
-            print(f"✗ Model {model} failed: {str(e)[:100]}")
-            continue
-    
+
     print("✓ GROQ API is working!")
-    
+
 except Exception as e:
     print(f"✗ Error: {e}")
     import traceback
@@ -0,0 +1,36 @@
+"""Test the city WebSocket endpoint
+
+Uses a short asyncio.wait_for timeout with one ping-and-retry instead of a
+single long blocking receive, so an idle server costs ~2s, not 10s.
+"""
+import asyncio
+import aiohttp
+
+WS_URL = "ws://localhost:8000/ws/city/Ahmedabad"
+RECEIVE_TIMEOUT = 2.0
+
+
+async def test_websocket():
+    async with aiohttp.ClientSession() as session:
+        async with session.ws_connect(WS_URL) as ws:
+            print(f"Connected to {WS_URL}")
+
+            try:
+                msg = await asyncio.wait_for(ws.receive(), timeout=RECEIVE_TIMEOUT)
+            except asyncio.TimeoutError:
+                # Nudge the server and retry once before failing
+                await ws.ping()
+                msg = await asyncio.wait_for(ws.receive(), timeout=RECEIVE_TIMEOUT)
+
+            if msg.type == aiohttp.WSMsgType.TEXT:
+                data = msg.json()
+                print(f"✅ Received update: type={data.get('type')}, city={data.get('city')}")
+                if data.get("type") == "update":
+                    print(f"   Active alerts: {data['alerts']['active_alerts']}")
+                    print(f"   Risk score: {data['risk'].get('risk_score')}")
+            else:
+                print(f"✗ Unexpected message type: {msg.type}")
+
+
+if __name__ == "__main__":
+    asyncio.run(test_websocket())
@@ -4,6 +4,9 @@ Seeds the database with initial cities and data sources
 """
 
 import asyncio
+import ssl
+import uuid
+from pathlib import Path
 from tortoise import Tortoise
 import logging
 import sys
@@ -12,7 +15,6 @@ import os
 # Add parent directory to path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from backend.app.models import City, DataSource
 from backend.app.config import get_settings
 
 logging.basicConfig(level=logging.INFO)
@@ -20,6 +22,14 @@ logger = logging.getLogger(__name__)
 
 settings = get_settings()
 
+# Parse the Aiven CA certificate once at import, not per main() call
+_CA_CERT_PATH = Path(__file__).parent.parent / 'backend' / 'ca-certificate.crt'
+_SSL_CTX = (
+    ssl.create_default_context(cafile=str(_CA_CERT_PATH))
+    if _CA_CERT_PATH.exists()
+    else ssl.create_default_context()
+)
+
 
 async def seed_cities():
     """Seed initial cities"""
@@ -41,17 +51,22 @@ async def seed_cities():
     ]
     
     logger.info("Seeding cities...")
-    for city_data in cities_data:
-        # Remove 'name' from city_data for defaults since it's used as filter
-        name = city_data.pop("name")
-        city, created = await City.get_or_create(
-            name=name,
-            defaults=city_data
+    # Raw executemany: one prepared upsert statement reused for every
+    # row, instead of Tortoise building per-row parameter tuples
+    conn = Tortoise.get_connection("default")
+    async with conn.acquire_connection() as raw_conn:
+        await raw_conn.executemany(
+            "INSERT INTO cities (id, name, state, population, latitude, longitude, created_at) "
+            "VALUES ($1, $2, $3, $4, $5, $6, now()) "
+            "ON CONFLICT (name) DO UPDATE SET "
+            "state = EXCLUDED.state, population = EXCLUDED.population, "
+            "latitude = EXCLUDED.latitude, longitude = EXCLUDED.longitude",
+            [
+                (uuid.uuid4(), c["name"], c["state"], c["population"], c["latitude"], c["longitude"])
+                for c in cities_data
+            ],
         )
-        if created:
-            logger.info(f"✅ City created: {city.name}")
-        else:
-            logger.info(f"ℹ️  City exists: {city.name}")
+    logger.info("✅ Upserted %d cities", len(cities_data))
 
 
 async def seed_data_sources():
@@ -70,29 +85,39 @@ async def seed_data_sources():
     ]
     
     logger.info("Seeding data sources...")
-    for source_data in sources_data:
-        # Remove 'name' from source_data for defaults since it's used as filter
-        name = source_data.pop("name")
-        source, created = await DataSource.get_or_create(
-            name=name,
-            defaults=source_data
+    # Raw executemany: one prepared upsert statement reused for every
+    # row, instead of Tortoise building per-row parameter tuples
+    conn = Tortoise.get_connection("default")
+    async with conn.acquire_connection() as raw_conn:
+        await raw_conn.executemany(
+            "INSERT INTO data_sources "
+            "(id, name, type, expected_frequency, is_online, failure_count, total_ingestions, created_at, updated_at) "
+            "VALUES ($1, $2, $3, $4, true, 0, 0, now(), now()) "
+            "ON CONFLICT (name) DO UPDATE SET "
+            "type = EXCLUDED.type, expected_frequency = EXCLUDED.expected_frequency, updated_at = now()",
+            [
+                (uuid.uuid4(), s["name"], s["type"], s["expected_frequency"])
+                for s in sources_data
+            ],
         )
-        if created:
-            logger.info(f"✅ Source created: {source.name}")
-        else:
-            logger.info(f"ℹ️  Source exists: {source.name}")
+    logger.info("✅ Upserted %d data sources", len(sources_data))
 
 
-async def main():
-    """Main seeding function"""
-    try:
-        import ssl
-        from pathlib import Path
-        
-        # Load CA certificate for Aiven PostgreSQL
-        ca_cert_path = Path(__file__).parent.parent / 'backend' / 'ca-certificate.crt'
-        ssl_context = ssl.create_default_context(cafile=str(ca_cert_path))
-        
+# Idempotent connection setup so orchestration code importing this
+# module can call main() repeatedly (or concurrently) without paying a
+# connect/disconnect cycle per call
+_db_lock = asyncio.Lock()
+_db_ready = False
+
+
+async def ensure_db(create_schemas: bool = True):
+    """Initialize Tortoise once; safe to call from concurrent tasks"""
+    global _db_ready
+    if _db_ready:
+        return
+    async with _db_lock:
+        if _db_ready:
+            return
         await Tortoise.init(
             config={
                 'connections': {
@@ -104,7 +129,11 @@ async def main():
                             'user': settings.DB_USER,
                             'password': settings.DB_PASSWORD,
                             'database': settings.DB_NAME,
-                            'ssl': ssl_context
+                            'ssl': _SSL_CTX,
+                            # Two connections so the gathered seeders
+                            # actually run in parallel
+                            'minsize': 2,
+                            'maxsize': 4,
                         }
                     }
                 },
@@ -116,21 +145,39 @@ async def main():
                 }
             }
         )
-        await Tortoise.generate_schemas()
+        # DDL is only needed on first deploy - reruns with --skip-schemas
+        # jump straight to the upserts
+        if create_schemas:
+            await Tortoise.generate_schemas(safe=True)
         logger.info("🗄️  Connected to database")
-        
-        await seed_cities()
-        await seed_data_sources()
-        
+        _db_ready = True
+
+
+async def main(close_db: bool = True, create_schemas: bool = True):
+    """Main seeding function
+
+    Pass close_db=False when calling from code that owns the connection
+    lifecycle and wants to keep the pool for further work, and
+    create_schemas=False to skip the idempotent-but-chatty DDL pass.
+    """
+    global _db_ready
+    try:
+        await ensure_db(create_schemas=create_schemas)
+
+        # Independent tables - seed them concurrently over the pool
+        await asyncio.gather(seed_cities(), seed_data_sources())
+
         logger.info("\n✅ Database seeding completed successfully!")
-        
+
     except Exception as e:
-        logger.error(f"❌ Seeding failed: {e}")
+        logger.error("❌ Seeding failed: %s", e)
         import traceback
         traceback.print_exc()
     finally:
-        await Tortoise.close_connections()
+        if close_db:
+            await Tortoise.close_connections()
+            _db_ready = False
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    asyncio.run(main(create_schemas='--skip-schemas' not in sys.argv))